@@ -30,62 +30,111 @@ class MissingAPIKeyError(Exception):
     """Exception for missing API key."""
 
 
+def build_app():
+    """App factory for uvicorn.
+
+    Reads the host/port from the environment (set by `main`) so that each
+    uvicorn worker process can rebuild the application on its own.
+    """
+    host = os.getenv('A2A_HOST', 'localhost')
+    port = int(os.getenv('A2A_PORT', '10100'))
+
+    capabilities = AgentCapabilities(streaming=True, pushNotifications=True)
+    skill = AgentSkill(
+        id='split_pdf',
+        name='PDF Split Tool',
+        description='Splits PDF documents into multiple smaller documents based on page ranges',
+        tags=['pdf', 'document splitting', 'adobe pdf services'],
+        examples=[
+            'Split document.pdf into pages 1-5 and 6-10',
+            'Split my presentation.pdf at pages 1-3, 4-7, and 8 to end'
+        ],
+    )
+    agent_card = AgentCard(
+        name='PDF Split Agent',
+        description='Splits PDF documents into multiple smaller documents using Adobe PDF Services',
+        url=f'http://{host}:{port}/',
+        version='1.0.0',
+        defaultInputModes=PdfSplitAgent.SUPPORTED_CONTENT_TYPES,
+        defaultOutputModes=PdfSplitAgent.SUPPORTED_CONTENT_TYPES,
+        capabilities=capabilities,
+        skills=[skill],
+    )
+
+    # --8<-- [start:DefaultRequestHandler]
+    httpx_client = httpx.AsyncClient()
+    # A2A_TASK_STORE=redis://... switches to Redis-backed state so task
+    # lookups and push configs work across uvicorn workers; the
+    # in-memory defaults are fine for single-process dev.
+    store_url = os.getenv('A2A_TASK_STORE')
+    if store_url:
+        from app.redis_store import RedisPushNotifier, RedisTaskStore
+
+        task_store = RedisTaskStore(store_url)
+        push_notifier = RedisPushNotifier(store_url, httpx_client)
+    else:
+        task_store = InMemoryTaskStore()
+        push_notifier = InMemoryPushNotifier(httpx_client)
+    request_handler = DefaultRequestHandler(
+        agent_executor=PdfSplitAgentExecutor(),
+        task_store=task_store,
+        push_notifier=push_notifier,
+    )
+    server = A2AStarletteApplication(
+        agent_card=agent_card, http_handler=request_handler
+    )
+    return server.build()
+    # --8<-- [end:DefaultRequestHandler]
+
+
 @click.command()
 @click.option('--host', 'host', default='localhost')
 @click.option('--port', 'port', default=10100)
-def main(host, port):
+@click.option(
+    '--workers',
+    'workers',
+    type=int,
+    default=lambda: int(os.getenv('WEB_CONCURRENCY', '1')),
+    help='Number of uvicorn worker processes; 2*nproc+1 is a reasonable '
+    'starting point for production. Note that InMemoryTaskStore and '
+    'InMemoryPushNotifier are per-process, so tasks are only visible to '
+    'the worker that created them when workers > 1.',
+)
+def main(host, port, workers):
     """Starts the PDF Split Agent server."""
     try:
         if not os.getenv('GOOGLE_API_KEY'):
             raise MissingAPIKeyError(
                 'GOOGLE_API_KEY environment variable not set.'
             )
-        
+
         if not os.getenv('PDF_SERVICES_CLIENT_ID'):
             raise MissingAPIKeyError(
                 'PDF_SERVICES_CLIENT_ID environment variable not set.'
             )
-        
+
         if not os.getenv('PDF_SERVICES_CLIENT_SECRET'):
             raise MissingAPIKeyError(
                 'PDF_SERVICES_CLIENT_SECRET environment variable not set.'
             )
 
-        capabilities = AgentCapabilities(streaming=True, pushNotifications=True)
-        skill = AgentSkill(
-            id='split_pdf',
-            name='PDF Split Tool',
-            description='Splits PDF documents into multiple smaller documents based on page ranges',
-            tags=['pdf', 'document splitting', 'adobe pdf services'],
-            examples=[
-                'Split document.pdf into pages 1-5 and 6-10',
-                'Split my presentation.pdf at pages 1-3, 4-7, and 8 to end'
-            ],
+        # Pass the listen address to the worker processes via the
+        # environment; uvicorn requires an import string (not an app
+        # object) to support multiple workers.
+        os.environ['A2A_HOST'] = host
+        os.environ['A2A_PORT'] = str(port)
+
+        # uvloop + httptools are drop-in C implementations of the event
+        # loop and HTTP parser, cutting per-request overhead.
+        uvicorn.run(
+            'app.__main__:build_app',
+            factory=True,
+            host=host,
+            port=port,
+            loop='uvloop',
+            http='httptools',
+            workers=workers,
         )
-        agent_card = AgentCard(
-            name='PDF Split Agent',
-            description='Splits PDF documents into multiple smaller documents using Adobe PDF Services',
-            url=f'http://{host}:{port}/',
-            version='1.0.0',
-            defaultInputModes=PdfSplitAgent.SUPPORTED_CONTENT_TYPES,
-            defaultOutputModes=PdfSplitAgent.SUPPORTED_CONTENT_TYPES,
-            capabilities=capabilities,
-            skills=[skill],
-        )
-
-        # --8<-- [start:DefaultRequestHandler]
-        httpx_client = httpx.AsyncClient()
-        request_handler = DefaultRequestHandler(
-            agent_executor=PdfSplitAgentExecutor(),
-            task_store=InMemoryTaskStore(),
-            push_notifier=InMemoryPushNotifier(httpx_client),
-        )
-        server = A2AStarletteApplication(
-            agent_card=agent_card, http_handler=request_handler
-        )
-
-        uvicorn.run(server.build(), host=host, port=port)
-        # --8<-- [end:DefaultRequestHandler]
 
     except MissingAPIKeyError as e:
         logger.error(f'Error: {e}')
@@ -6,8 +6,12 @@ NOTICE: Adobe permits you to use, modify, and distribute this file in
 accordance with the terms of the Adobe license agreement accompanying it.
 """
 
+import asyncio
 import logging
 import os
+import re
+import shutil
+import threading
 from datetime import datetime
 from typing import Any, Any, AsyncIterable
 
@@ -27,17 +31,100 @@ from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.adk.tools.tool_context import ToolContext
+from dotenv import load_dotenv
+
 from google.genai import types
 
 # Initialize the logger
 logging.basicConfig(level=logging.INFO)
 
-def split_pdf(file_path: str, page_ranges: list[str]) -> dict[str, Any]:
+# Load .env before the credential constants below are read; this module
+# is imported before __main__ gets a chance to call load_dotenv itself.
+load_dotenv()
+
+# Adobe credentials, read once at import so the request path never
+# touches os.environ. __main__ validates these before serving; the
+# check in _get_pdf_services covers other entry points.
+_CLIENT_ID = os.getenv('PDF_SERVICES_CLIENT_ID')
+_CLIENT_SECRET = os.getenv('PDF_SERVICES_CLIENT_SECRET')
+
+# The credentials object caches its OAuth token, so building the client
+# once per process avoids a token round-trip on every tool call.
+_PDF_SERVICES: PDFServices | None = None
+_pdf_services_lock = threading.Lock()
+
+
+def _get_pdf_services() -> PDFServices:
+    """Returns the process-wide PDFServices client, creating it on first use."""
+    global _PDF_SERVICES
+    if _PDF_SERVICES is None:
+        with _pdf_services_lock:
+            if _PDF_SERVICES is None:
+                if not _CLIENT_ID or not _CLIENT_SECRET:
+                    raise ValueError(
+                        'PDF_SERVICES_CLIENT_ID and PDF_SERVICES_CLIENT_SECRET '
+                        'environment variables must be set.'
+                    )
+                credentials = ServicePrincipalCredentials(
+                    client_id=_CLIENT_ID,
+                    client_secret=_CLIENT_SECRET
+                )
+                _PDF_SERVICES = PDFServices(credentials=credentials)
+    return _PDF_SERVICES
+
+
+def _read_file(file_path: str) -> bytes:
+    """Reads a file into memory; run in a worker thread."""
+    with open(file_path, 'rb') as file:
+        return file.read()
+
+
+# Copy buffer size for streaming downloads to disk
+_COPY_CHUNK_SIZE = 1 << 20
+
+# How many result assets may download (and be buffered) at once; tunable
+# via PDF_SPLIT_CONCURRENCY, capped to keep memory and API load bounded
+_DEFAULT_DOWNLOAD_CONCURRENCY = 5
+_MAX_DOWNLOAD_CONCURRENCY = 15
+
+
+def _download_concurrency() -> int:
+    """Reads the download worker count from PDF_SPLIT_CONCURRENCY."""
+    try:
+        value = int(os.getenv('PDF_SPLIT_CONCURRENCY', str(_DEFAULT_DOWNLOAD_CONCURRENCY)))
+    except ValueError:
+        value = _DEFAULT_DOWNLOAD_CONCURRENCY
+    return max(1, min(value, _MAX_DOWNLOAD_CONCURRENCY))
+
+
+def _download_one(pdf_services: PDFServices, result_asset, index: int, output_dir: str) -> str:
+    """Downloads one result asset to disk; run in a worker thread."""
+    stream_asset: StreamAsset = pdf_services.get_content(result_asset)
+    output_file_path = os.path.join(output_dir, f"split_{index+1}.pdf")
+
+    content = stream_asset.get_input_stream()
+    with open(output_file_path, "wb") as file:
+        if hasattr(content, "read"):
+            # File-like stream: copy in bounded chunks so peak memory
+            # stays at the buffer size, not the full output PDF.
+            shutil.copyfileobj(content, file, length=_COPY_CHUNK_SIZE)
+        else:
+            file.write(content)
+    # Drop the buffer reference right away so large outputs are
+    # reclaimable while the remaining assets download.
+    del content
+
+    return output_file_path
+
+
+async def split_pdf(file_path: str, page_ranges: list[str]) -> dict[str, Any]:
     """Splits a PDF file into multiple documents based on page ranges.
 
     This tool uses the Adobe PDF Services API to perform the splitting
-    operation. Adobe PDF Services credentials are pre-loaded as
-    environment variables:
+    operation. The blocking Adobe SDK calls are offloaded to worker
+    threads so the server's event loop stays free during the
+    multi-second upload/poll/download cycle. Adobe PDF Services
+    credentials are pre-loaded as environment variables:
     - PDF_SERVICES_CLIENT_ID
     - PDF_SERVICES_CLIENT_SECRET
 
@@ -60,29 +147,27 @@ def split_pdf(file_path: str, page_ranges: list[str]) -> dict[str, Any]:
         return {"error": f"File not found at path: {file_path}"}
 
     output_dir = os.path.join(os.path.dirname(file_path), "output")
-    if not os.path.exists(output_dir):
-        try:
-            os.makedirs(output_dir)
-        except OSError as e:
-            logging.exception(f"Failed to create output directory: {e}")
-            return {"error": f"Failed to create output directory: {e}"}
-    
     try:
-        with open(file_path, 'rb') as file:
-            input_stream = file.read()
+        # exist_ok makes this one atomic syscall and safe under
+        # concurrent invocations
+        os.makedirs(output_dir, exist_ok=True)
+    except OSError as e:
+        logging.exception(f"Failed to create output directory: {e}")
+        return {"error": f"Failed to create output directory: {e}"}
 
-        # Initial setup, create credentials instance
-        credentials = ServicePrincipalCredentials(
-            client_id=os.getenv('PDF_SERVICES_CLIENT_ID'),
-            client_secret=os.getenv('PDF_SERVICES_CLIENT_SECRET')
-        )
 
-        # Creates a PDF Services instance
-        pdf_services = PDFServices(credentials=credentials)
+    try:
+        input_stream = await asyncio.to_thread(_read_file, file_path)
+
+        # Reuse the process-wide PDF Services instance
+        pdf_services = _get_pdf_services()
 
         # Creates an asset from source file and upload
-        input_asset = pdf_services.upload(input_stream=input_stream,
-                                          mime_type=PDFServicesMediaType.PDF)
+        input_asset = await asyncio.to_thread(
+            pdf_services.upload,
+            input_stream=input_stream,
+            mime_type=PDFServicesMediaType.PDF,
+        )
 
         # Parse page ranges from string format to Adobe SDK format
         parsed_page_ranges = _parse_page_ranges(page_ranges)
@@ -94,22 +179,43 @@ def split_pdf(file_path: str, page_ranges: list[str]) -> dict[str, Any]:
         split_pdf_job = SplitPDFJob(input_asset, split_pdf_params)
 
         # Submit the job and gets the job result
-        location = pdf_services.submit(split_pdf_job)
-        pdf_services_response = pdf_services.get_job_result(location, SplitPDFResult)
+        location = await asyncio.to_thread(pdf_services.submit, split_pdf_job)
+        pdf_services_response = await asyncio.to_thread(
+            pdf_services.get_job_result, location, SplitPDFResult
+        )
 
-        # Get content from the resulting asset(s)
+        # Get content from the resulting asset(s) and download them in
+        # parallel, bounded so only a few outputs are resident at once
         result_assets = pdf_services_response.get_result().get_assets()
-        
+
+        semaphore = asyncio.Semaphore(_download_concurrency())
+
+        async def download(index, result_asset):
+            async with semaphore:
+                return await asyncio.to_thread(
+                    _download_one, pdf_services, result_asset, index, output_dir
+                )
+
+        results = await asyncio.gather(
+            *[
+                download(i, result_asset)
+                for i, result_asset in enumerate(result_assets)
+            ],
+            return_exceptions=True,
+        )
+
+        # One failed part shouldn't throw away the parts that succeeded
         output_file_paths = []
-        for i, result_asset in enumerate(result_assets):
-            stream_asset: StreamAsset = pdf_services.get_content(result_asset)
-            output_file_path = os.path.join(output_dir, f"split_{i+1}.pdf")
-            
-            with open(output_file_path, "wb") as file:
-                file.write(stream_asset.get_input_stream())
-            
-            output_file_paths.append(output_file_path)
+        failed_parts = []
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                logging.error(f"Failed to download split part {i+1}: {result}")
+                failed_parts.append({"part": i + 1, "error": str(result)})
+            else:
+                output_file_paths.append(result)
 
+        if failed_parts:
+            return {"output_files": output_file_paths, "failed_parts": failed_parts}
         return {"output_files": output_file_paths}
 
     except (ServiceApiException, ServiceUsageException, SdkException) as e:
@@ -120,30 +226,38 @@ def split_pdf(file_path: str, page_ranges: list[str]) -> dict[str, Any]:
         return {"error": str(e)}
 
 
+# Matches "3", "1-5", "6-", and "-5" (start defaults to 1) in one pass
+_RANGE_RE = re.compile(r'^\s*(\d+)?\s*(?:(-)\s*(\d+)?)?\s*$')
+
+
 def _parse_page_ranges(page_ranges: list[str]) -> PageRanges:
-    """Parse page range strings into Adobe SDK PageRanges object."""
+    """Parse page range strings into Adobe SDK PageRanges object.
+
+    Raises:
+        ValueError: If a range string is not a valid page range.
+    """
     parsed_ranges = PageRanges()
-    
+
     for range_str in page_ranges:
-        range_str = range_str.strip()
-        
-        if '-' in range_str:
-            parts = range_str.split('-', 1)
-            start = int(parts[0]) if parts[0] else 1
-            
-            if parts[1]:  # End page specified (e.g., "1-5")
-                end = int(parts[1])
-                if start == end:
-                    parsed_ranges.add_single_page(start)
-                else:
-                    parsed_ranges.add_range(start, end)
-            else:  # No end page (e.g., "6-")
-                parsed_ranges.add_all_from(start)
-        else:
+        m = _RANGE_RE.match(range_str)
+        if m is None or (m.group(1) is None and m.group(2) is None):
+            raise ValueError(f'Invalid page range: {range_str!r}')
+
+        start_str, dash, end_str = m.groups()
+        if dash is None:
             # Single page (e.g., "3")
-            page = int(range_str)
-            parsed_ranges.add_single_page(page)
-    
+            parsed_ranges.add_single_page(int(start_str))
+        elif end_str is None:
+            # No end page (e.g., "6-")
+            parsed_ranges.add_all_from(int(start_str) if start_str else 1)
+        else:
+            start = int(start_str) if start_str else 1
+            end = int(end_str)
+            if start == end:
+                parsed_ranges.add_single_page(start)
+            else:
+                parsed_ranges.add_range(start, end)
+
     return parsed_ranges
 
 
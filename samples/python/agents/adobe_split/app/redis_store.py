@@ -0,0 +1,92 @@
+"""Redis-backed task store and push notifier.
+
+The in-memory implementations in the a2a SDK are per-process: with
+uvicorn --workers > 1, a task created on one worker is invisible to the
+others. These variants keep task state and push-notification configs in
+Redis so every worker shares them. Requires the optional `redis`
+dependency (install with the `redis` extra).
+"""
+
+import logging
+
+import httpx
+
+from a2a.server.tasks import PushNotifier, TaskStore
+from a2a.types import PushNotificationConfig, Task
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+_TASK_PREFIX = 'a2a:task:'
+_PUSH_PREFIX = 'a2a:push:'
+
+
+def _connect(url: str):
+    if aioredis is None:
+        raise ImportError(
+            'The redis package is required for a Redis-backed task store; '
+            'install with the "redis" extra.'
+        )
+    pool = aioredis.ConnectionPool.from_url(url, max_connections=64)
+    return aioredis.Redis(connection_pool=pool)
+
+
+class RedisTaskStore(TaskStore):
+    """TaskStore that keeps tasks in Redis, shared across workers."""
+
+    def __init__(self, url: str):
+        self._redis = _connect(url)
+
+    async def save(self, task: Task):
+        await self._redis.set(_TASK_PREFIX + task.id, task.model_dump_json())
+
+    async def get(self, task_id: str) -> Task | None:
+        data = await self._redis.get(_TASK_PREFIX + task_id)
+        if data is None:
+            return None
+        return Task.model_validate_json(data)
+
+    async def delete(self, task_id: str):
+        await self._redis.delete(_TASK_PREFIX + task_id)
+
+
+class RedisPushNotifier(PushNotifier):
+    """PushNotifier that keeps notification configs in Redis."""
+
+    def __init__(self, url: str, httpx_client: httpx.AsyncClient):
+        self._redis = _connect(url)
+        self._client = httpx_client
+
+    async def set_info(
+        self, task_id: str, notification_config: PushNotificationConfig
+    ):
+        await self._redis.set(
+            _PUSH_PREFIX + task_id, notification_config.model_dump_json()
+        )
+
+    async def get_info(self, task_id: str) -> PushNotificationConfig | None:
+        data = await self._redis.get(_PUSH_PREFIX + task_id)
+        if data is None:
+            return None
+        return PushNotificationConfig.model_validate_json(data)
+
+    async def delete_info(self, task_id: str):
+        await self._redis.delete(_PUSH_PREFIX + task_id)
+
+    async def send_notification(self, task: Task):
+        config = await self.get_info(task.id)
+        if config is None:
+            return
+        try:
+            response = await self._client.post(
+                config.url, json=task.model_dump(mode='json', exclude_none=True)
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.error(
+                f'Failed to send push notification for task {task.id}: {e}'
+            )
@@ -1,3 +1,5 @@
+import asyncio
+
 from app.agent import split_pdf
 
-print(split_pdf("~/Desktop/barfoot_ser17.pdf", ["1-2", "3-5", "6-"]))
\ No newline at end of file
+print(asyncio.run(split_pdf("~/Desktop/barfoot_ser17.pdf", ["1-2", "3-5", "6-"])))
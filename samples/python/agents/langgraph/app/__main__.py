@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 import sys
@@ -73,16 +74,42 @@ def main(host, port):
 
         # --8<-- [start:DefaultRequestHandler]
         httpx_client = httpx.AsyncClient()
+        agent_executor = CurrencyAgentExecutor()
         request_handler = DefaultRequestHandler(
-            agent_executor=CurrencyAgentExecutor(),
+            agent_executor=agent_executor,
             task_store=InMemoryTaskStore(),
             push_notifier=InMemoryPushNotifier(httpx_client),
         )
         server = A2AStarletteApplication(
             agent_card=agent_card, http_handler=request_handler
         )
+        app = server.build()
 
-        uvicorn.run(server.build(), host=host, port=port)
+        async def warmup():
+            """Kicks off the MCP handshake in the background at startup.
+
+            Runs as a fire-and-forget task so the HTTP server comes up
+            immediately; the first request no longer pays the MCP
+            connect + tools/list + graph-compilation cost. A failure
+            here is logged and retried on first use.
+            """
+
+            async def init():
+                try:
+                    await agent_executor.agent._initialize_tools()
+                except Exception as e:
+                    logger.warning(
+                        f'MCP warmup failed, will retry on first request: {e}'
+                    )
+
+            # Keep a strong reference on app.state: the loop holds only
+            # weak references to tasks, so an anonymous task could be
+            # garbage-collected mid-handshake
+            app.state.mcp_warmup_task = asyncio.create_task(init())
+
+        app.add_event_handler('startup', warmup)
+
+        uvicorn.run(app, host=host, port=port)
         # --8<-- [end:DefaultRequestHandler]
 
     except MissingAPIKeyError as e:
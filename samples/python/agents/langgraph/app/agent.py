@@ -17,6 +17,38 @@ import asyncio
 
 memory = MemorySaver()
 
+# Compiled react agents shared across CurrencyAgent instances, keyed by
+# model, tool names, and prompt so an identical configuration only pays
+# graph compilation once per process.
+_GRAPH_CACHE: dict[tuple, Any] = {}
+
+# One MCP client and tool set per process, shared by every CurrencyAgent
+# so concurrent sessions multiplex over the same streamable-http server
+# instead of each negotiating their own.
+_MCP_SERVER_URL = os.getenv("MCP_SERVER_URL", "http://localhost:8000")
+_mcp_lock = asyncio.Lock()
+_mcp_client: MultiServerMCPClient | None = None
+_mcp_tools = None
+
+
+async def _get_mcp_tools():
+    """Returns the process-wide MCP tool set, connecting on first use."""
+    global _mcp_client, _mcp_tools
+    async with _mcp_lock:
+        if _mcp_tools is None:
+            # Use MultiServerMCPClient for streamable-http transport
+            _mcp_client = MultiServerMCPClient(
+                {
+                    "currency": {
+                        "url": f"{_MCP_SERVER_URL}/mcp/",
+                        "transport": "streamable_http",
+                    }
+                }
+            )
+            # Listing the tools doubles as a health check on the server
+            _mcp_tools = await _mcp_client.get_tools()
+        return _mcp_tools
+
 class ResponseFormat(BaseModel):
     """Respond to the user in this format."""
 
@@ -24,6 +56,46 @@ class ResponseFormat(BaseModel):
     message: str
 
 
+# Response templates for get_agent_response; copied before the content
+# is filled in so the shared dicts are never handed out mutable.
+_RESP_INPUT_REQUIRED = {
+    'is_task_complete': False,
+    'require_user_input': True,
+    'content': None,
+}
+_RESP_ERROR = {
+    'is_task_complete': False,
+    'require_user_input': True,
+    'content': None,
+}
+_RESP_COMPLETED = {
+    'is_task_complete': True,
+    'require_user_input': False,
+    'content': None,
+}
+_RESP_UNAVAILABLE = {
+    'is_task_complete': False,
+    'require_user_input': True,
+    'content': (
+        'We are unable to process your request at the moment. '
+        'Please try again.'
+    ),
+}
+
+# Constant progress updates yielded from stream(); never mutated, so a
+# single shared dict per message is enough.
+_RESP_LOOKING_UP = {
+    'is_task_complete': False,
+    'require_user_input': False,
+    'content': 'Looking up the exchange rates...',
+}
+_RESP_PROCESSING = {
+    'is_task_complete': False,
+    'require_user_input': False,
+    'content': 'Processing the exchange rates..',
+}
+
+
 class CurrencyAgent:
     """CurrencyAgent - a specialized assistant for currency convesions."""
 
@@ -40,45 +112,49 @@ class CurrencyAgent:
     def __init__(self):
         model_source = os.getenv("model_source", "google")
         if model_source == "google":
-            self.model = ChatGoogleGenerativeAI(model='gemini-2.0-flash')
+            model_name = 'gemini-2.0-flash'
+            self.model = ChatGoogleGenerativeAI(model=model_name)
         else:
+            model_name = os.getenv("TOOL_LLM_NAME")
             self.model = ChatOpenAI(
-                 model=os.getenv("TOOL_LLM_NAME"),
+                 model=model_name,
                  openai_api_key=os.getenv("API_KEY", "EMPTY"),
                  openai_api_base=os.getenv("TOOL_LLM_URL"),
                  temperature=0
              )
-        
-        # Use the correct URL for streamable-http transport
-        self.server_url = "http://localhost:8000"
-        
+        self._graph_key = (model_source, model_name)
+
         # Store client and tools references
         self.client = None
         self.tools = None
         self.graph = None
+        self._init_lock = asyncio.Lock()
 
     async def _initialize_tools(self):
-        """Initialize MCP tools using MultiServerMCPClient."""
-        if self.tools is None:
-            # Use MultiServerMCPClient for streamable-http transport
-            self.client = MultiServerMCPClient(
-                {
-                    "currency": {
-                        "url": f"{self.server_url}/mcp/",
-                        "transport": "streamable_http",
-                    }
-                }
-            )
-            
-            self.tools = await self.client.get_tools()
-            
-            self.graph = create_react_agent(
-                self.model,
-                tools=self.tools,
-                checkpointer=memory,
-                prompt=self.SYSTEM_INSTRUCTION,
-                response_format=ResponseFormat,
+        """Initialize MCP tools from the shared process-wide client."""
+        async with self._init_lock:
+            if self.tools is not None:
+                return
+
+            self.tools = await _get_mcp_tools()
+            self.client = _mcp_client
+
+            key = (
+                self._graph_key,
+                tuple(sorted(tool.name for tool in self.tools)),
+                hash(self.SYSTEM_INSTRUCTION),
             )
+            graph = _GRAPH_CACHE.get(key)
+            if graph is None:
+                graph = create_react_agent(
+                    self.model,
+                    tools=self.tools,
+                    checkpointer=memory,
+                    prompt=self.SYSTEM_INSTRUCTION,
+                    response_format=ResponseFormat,
+                )
+                _GRAPH_CACHE[key] = graph
+            self.graph = graph
 
     async def invoke(self, query, context_id) -> str:
         await self._initialize_tools()
@@ -93,34 +169,27 @@ class CurrencyAgent:
 
         async for item in self.graph.astream(inputs, config, stream_mode='values'):
             message = item['messages'][-1]
-            if (
-                isinstance(message, AIMessage)
-                and message.tool_calls
-                and len(message.tool_calls) > 0
-            ):
-                yield {
-                    'is_task_complete': False,
-                    'require_user_input': False,
-                    'content': 'Looking up the exchange rates...',
-                }
-            elif isinstance(message, ToolMessage):
-                yield {
-                    'is_task_complete': False,
-                    'require_user_input': False,
-                    'content': 'Processing the exchange rates..',
-                }
+            # type() identity checks instead of isinstance: this runs
+            # for every streamed item, and the message classes here are
+            # never subclassed
+            message_type = type(message)
+            if message_type is AIMessage and message.tool_calls:
+                yield _RESP_LOOKING_UP
+            elif message_type is ToolMessage:
+                yield _RESP_PROCESSING
 
         yield self.get_agent_response(config)
 
     async def cleanup(self):
-        """Clean up resources when done."""
-        try:
-            if self.client:
-                await self.client.cleanup()
-                self.client = None
-                self.tools = None
-        except Exception as e:
-            print(f"Error cleaning up client: {e}")
+        """Clean up resources when done.
+
+        The MCP client is shared process-wide, so only this instance's
+        references are dropped; the connection stays available for other
+        agents.
+        """
+        self.client = None
+        self.tools = None
+        self.graph = None
 
     def get_agent_response(self, config):
         current_state = self.graph.get_state(config)
@@ -130,31 +199,17 @@ class CurrencyAgent:
         if structured_response and isinstance(
             structured_response, ResponseFormat
         ):
+            template = None
             if structured_response.status == 'input_required':
-                return {
-                    'is_task_complete': False,
-                    'require_user_input': True,
-                    'content': structured_response.message,
-                }
-            if structured_response.status == 'error':
-                return {
-                    'is_task_complete': False,
-                    'require_user_input': True,
-                    'content': structured_response.message,
-                }
-            if structured_response.status == 'completed':
-                return {
-                    'is_task_complete': True,
-                    'require_user_input': False,
-                    'content': structured_response.message,
-                }
-        return {
-            'is_task_complete': False,
-            'require_user_input': True,
-            'content': (
-                'We are unable to process your request at the moment. '
-                'Please try again.'
-            ),
-        }
+                template = _RESP_INPUT_REQUIRED
+            elif structured_response.status == 'error':
+                template = _RESP_ERROR
+            elif structured_response.status == 'completed':
+                template = _RESP_COMPLETED
+            if template is not None:
+                response = template.copy()
+                response['content'] = structured_response.message
+                return response
+        return _RESP_UNAVAILABLE.copy()
 
     SUPPORTED_CONTENT_TYPES = ['text', 'text/plain']
@@ -1,7 +1,41 @@
+import asyncio
+import time
+
 import httpx
+import orjson
+
+# One long-lived client for the process: keeps connections alive across
+# calls so repeated lookups skip the TCP+TLS handshake. HTTP/2 lets
+# concurrent lookups multiplex over the single connection, and gzip
+# shrinks the rate payloads considerably.
+_CLIENT = httpx.AsyncClient(
+    base_url='https://api.frankfurter.app',
+    http2=True,
+    timeout=10.0,
+    limits=httpx.Limits(max_keepalive_connections=20),
+    headers={'Accept-Encoding': 'gzip'},
+)
+
+# "latest" rates change at most once a day, so a short TTL is safe;
+# historical rates are immutable and never expire.
+_LATEST_TTL = 3600.0
+_LATEST_MAXSIZE = 1024
+_HISTORICAL_MAXSIZE = 4096
+
 
 class CurrencyService:
-    def get_exchange_rate(
+    def __init__(self):
+        # key -> (expires_at, data) for "latest" lookups
+        self._latest_cache: dict[tuple, tuple[float, dict]] = {}
+        # key -> data for immutable historical lookups
+        self._historical_cache: dict[tuple, dict] = {}
+        self._cache_lock = asyncio.Lock()
+        # key -> Future for in-flight fetches, so concurrent misses for
+        # the same tuple share one upstream request
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._inflight_lock = asyncio.Lock()
+
+    async def get_exchange_rate(
         self,  # Add self parameter
         currency_from: str = 'USD',
         currency_to: str = 'EUR',
@@ -19,18 +53,86 @@ class CurrencyService:
             A dictionary containing the exchange rate data, or an error message if
             the request fails.
         """
+        key = (currency_from, currency_to, currency_date)
+        cached = await self._cache_get(key, currency_date)
+        if cached is not None:
+            return cached
+
+        # Singleflight: the first miss for a key does the fetch, any
+        # concurrent callers for the same key await its result.
+        async with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = asyncio.get_running_loop().create_future()
+                self._inflight[key] = future
+
+        if not is_owner:
+            return await future
+
+        try:
+            data = await self._fetch(currency_from, currency_to, currency_date)
+            if 'error' not in data:
+                await self._cache_put(key, currency_date, data)
+            future.set_result(data)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            async with self._inflight_lock:
+                self._inflight.pop(key, None)
+        return data
+
+    async def _fetch(self, currency_from, currency_to, currency_date):
         try:
-            response = httpx.get(
-                f'https://api.frankfurter.app/{currency_date}',
+            response = await _CLIENT.get(
+                f'/{currency_date}',
                 params={'from': currency_from, 'to': currency_to},
             )
             response.raise_for_status()
 
-            data = response.json()
+            # orjson.JSONDecodeError subclasses ValueError, so the
+            # existing handler below still applies
+            data = orjson.loads(response.content)
             if 'rates' not in data:
                 return {'error': 'Invalid API response format.'}
             return data
         except httpx.HTTPError as e:
             return {'error': f'API request failed: {e}'}
         except ValueError:
-            return {'error': 'Invalid JSON response from API.'}
\ No newline at end of file
+            return {'error': 'Invalid JSON response from API.'}
+
+    async def _cache_get(self, key, currency_date):
+        async with self._cache_lock:
+            if currency_date == 'latest':
+                entry = self._latest_cache.get(key)
+                if entry is None:
+                    return None
+                expires_at, data = entry
+                if time.monotonic() >= expires_at:
+                    del self._latest_cache[key]
+                    return None
+                return data
+            return self._historical_cache.get(key)
+
+    async def _cache_put(self, key, currency_date, data):
+        async with self._cache_lock:
+            if currency_date == 'latest':
+                if len(self._latest_cache) >= _LATEST_MAXSIZE:
+                    # Drop the oldest insertion; entries also age out via TTL.
+                    self._latest_cache.pop(next(iter(self._latest_cache)))
+                self._latest_cache[key] = (time.monotonic() + _LATEST_TTL, data)
+            else:
+                if len(self._historical_cache) >= _HISTORICAL_MAXSIZE:
+                    self._historical_cache.pop(next(iter(self._historical_cache)))
+                self._historical_cache[key] = data
+
+    async def cache_clear(self):
+        """Empties both rate caches."""
+        async with self._cache_lock:
+            self._latest_cache.clear()
+            self._historical_cache.clear()
+
+    async def aclose(self):
+        """Closes the shared HTTP client."""
+        await _CLIENT.aclose()
@@ -1,3 +1,7 @@
+import os
+
+import uvicorn
+
 from mcp.server.fastmcp import FastMCP
 
 from currency_service import CurrencyService
@@ -7,7 +11,7 @@ mcp = FastMCP("Currency Exchange Server")
 currency_service = CurrencyService()
 
 @mcp.tool()
-def get_exchange_rate(currency_from: str = 'USD', currency_to: str = 'EUR', currency_date: str = 'latest') -> dict:
+async def get_exchange_rate(currency_from: str = 'USD', currency_to: str = 'EUR', currency_date: str = 'latest') -> dict:
     """
     Get the exchange rate between two currencies using the Frankfurter API.
     :param currency_from: The currency to convert from (e.g., "USD")
@@ -16,8 +20,31 @@ def get_exchange_rate(currency_from: str = 'USD', currency_to: str = 'EUR', curr
     :return: a dictionary containing the exchange rate data
     """
     print(f"Fetching exchange rate from {currency_from} to {currency_to} for date {currency_date}")
-    return currency_service.get_exchange_rate(currency_from, currency_to, currency_date)
+    return await currency_service.get_exchange_rate(currency_from, currency_to, currency_date)
+
+@mcp.tool()
+async def clear_rate_cache() -> dict:
+    """
+    Admin tool: clear the cached exchange rates so the next lookup hits the API.
+    :return: a dictionary confirming the cache was cleared
+    """
+    await currency_service.cache_clear()
+    return {"status": "cache cleared"}
+
+# Module-level ASGI app so uvicorn can import it when spawning workers
+app = mcp.streamable_http_app()
+# Close the shared Frankfurter HTTP client when the server stops
+app.add_event_handler("shutdown", currency_service.aclose)
 
 if __name__ == "__main__":
     # mcp.run(transport="stdio") # local
-    mcp.run(transport="streamable-http") # default port 8000
\ No newline at end of file
+    # Serve the streamable-http app directly under uvicorn so the C
+    # event loop/parser and multi-worker scaling (MCP_WORKERS) apply
+    uvicorn.run(
+        "mcp_currency_server:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("MCP_WORKERS", "1")),
+    )
\ No newline at end of file
@@ -16,7 +16,7 @@ from a2a.types import (
 )
 from dotenv import load_dotenv
 
-from app.agent import UnitConversionAgent
+from app.agent import UnitConversionAgent, aclose_ucum_client
 from app.agent_executor import UnitAgentExecutor
 
 
@@ -70,8 +70,11 @@ def main(host, port):
         server = A2AStarletteApplication(
             agent_card=agent_card, http_handler=request_handler
         )
+        app = server.build()
+        # Close the shared UCUM HTTP client when the server stops
+        app.add_event_handler('shutdown', aclose_ucum_client)
 
-        uvicorn.run(server.build(), host=host, port=port)
+        uvicorn.run(app, host=host, port=port)
         # --8<-- [end:DefaultRequestHandler]
 
     except MissingAPIKeyError as e:
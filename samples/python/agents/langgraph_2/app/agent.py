@@ -1,9 +1,12 @@
+import asyncio
+import re
+
 from collections.abc import AsyncIterable
+from functools import lru_cache
 from typing import Any, Literal
 
 import httpx
 
-from langchain_core.messages import AIMessage, ToolMessage
 from langchain_core.tools import tool
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.checkpoint.memory import MemorySaver
@@ -11,67 +14,134 @@ from langgraph.prebuilt import create_react_agent
 from pydantic import BaseModel
 
 
-memory = MemorySaver()
+class BoundedMemorySaver(MemorySaver):
+    """MemorySaver capped at a fixed number of conversation threads.
 
+    The stock MemorySaver grows monotonically as every new context_id
+    adds checkpoints, a slow leak on long-running servers. This variant
+    evicts the least-recently-written thread once the cap is exceeded,
+    keeping the footprint constant.
+    """
 
-@tool
-def convert_units(
+    def __init__(self, max_threads: int = 10_000):
+        super().__init__()
+        self.max_threads = max_threads
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        result = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = config['configurable']['thread_id']
+        # Re-inserting keeps dict order as least-recently-written first
+        self.storage[thread_id] = self.storage.pop(thread_id)
+        while len(self.storage) > self.max_threads:
+            evicted = next(iter(self.storage))
+            del self.storage[evicted]
+            for key in [k for k in self.writes if k[0] == evicted]:
+                del self.writes[key]
+            # The serialized channel values (the bulk of a thread's
+            # memory) live in blobs, keyed by thread_id as well
+            for key in [k for k in self.blobs if k[0] == evicted]:
+                del self.blobs[key]
+        return result
+
+
+memory = BoundedMemorySaver()
+
+# One long-lived client for all UCUM calls: pooled keep-alive
+# connections skip the per-call TCP+TLS handshake, and the async API
+# keeps the server's event loop free during the fetch.
+_UCUM_CLIENT = httpx.AsyncClient(
+    timeout=10.0,
+    limits=httpx.Limits(
+        max_connections=200,
+        max_keepalive_connections=100,
+        keepalive_expiry=30.0,
+    ),
+)
+
+
+# Extracts the converted value from a UCUM response in one scan,
+# e.g. "Result: 1.0 [in_i] = 2.54 cm" -> "2.54"
+_RESULT_RE = re.compile(r"Result:\s*.+?=\s*(-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)")
+
+# Conversions are deterministic, so successful results are cached for
+# the life of the process. UCUM codes are case-sensitive ('M' and 'm'
+# differ), so keys are only whitespace-normalized.
+_UCUM_CACHE: dict[tuple, dict] = {}
+_UCUM_CACHE_MAXSIZE = 4096
+
+
+# Chat-model clients own pooled HTTP sessions to the LLM endpoint, so
+# one instance per (provider, model) is shared process-wide instead of
+# paying a fresh TLS handshake per construction.
+_LLM_CACHE: dict[tuple, Any] = {}
+
+
+def _get_llm(provider: str, model: str):
+    """Returns the shared chat-model client for (provider, model)."""
+    key = (provider, model)
+    llm = _LLM_CACHE.get(key)
+    if llm is None:
+        llm = ChatGoogleGenerativeAI(model=model)
+        _LLM_CACHE[key] = llm
+    return llm
+
+
+async def aclose_ucum_client():
+    """Closes the shared UCUM HTTP client; call on server shutdown."""
+    await _UCUM_CLIENT.aclose()
+
+
+async def _convert_one(
     value: float,
     from_unit: str,
     to_unit: str,
 ):
-    """Use this to convert between different units of measurement.
-    This tool utilizes the UCUM (Unified Code for Units of Measure) web service for conversions.
-    Refer to UCUM documentation for valid unit notations (e.g., 'm' for meter, 'km' for kilometer, '[ft_i]' for international foot, 'cel' for Celsius, 'degF' for Fahrenheit).
+    """Performs one UCUM conversion; shared by both conversion tools."""
+    try:
+        from_unit = from_unit.strip()
+        to_unit = to_unit.strip()
 
-    Args:
-        value: The numeric value to convert.
-        from_unit: The unit to convert from (e.g., "m", "kg", "cel", "[ft_i]").
-        to_unit: The unit to convert to (e.g., "ft", "lb", "degF", "cm").
+        key = (value, from_unit, to_unit)
+        cached = _UCUM_CACHE.get(key)
+        if cached is not None:
+            return cached
 
-    Returns:
-        A dictionary containing the conversion result, or an error message if
-        the conversion fails.
-    """
-    try:
         # Construct the UCUM API URL
         # The value is placed directly in the URL path for UCUM
         url = f'https://ucum.nlm.nih.gov/ucum-service/v1/ucumtransform/{value}/from/{from_unit}/to/{to_unit}'
-        
-        response = httpx.get(url)
-        response.raise_for_status()
 
         # UCUM API returns a plain text string with the result (e.g., "1.0 [in_i] = 2.54 cm")
         # We need to parse this string to extract the converted value.
-        data = response.text.strip()
+        # Only the first non-empty line matters, so stream the response
+        # and stop reading once we have it instead of buffering the
+        # whole body.
+        data = ''
+        async with _UCUM_CLIENT.stream('GET', url) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                data = line.strip()
+                if data:
+                    break
         print(f"UCUM API Raw Response: {data}")
 
-        if "Result:" in data:
+        prefix_index = data.find("Result: ")
+        if prefix_index != -1:
             # Example: "Result: 1.0 [in_i] = 2.54 cm"
-            parts = data.split("=")
-            if len(parts) == 2:
-                converted_string = parts[1].strip()
-                # Extract the numeric value from the converted string
-                # This is a bit of a naive parse and might need refinement for complex cases
-                converted_value_str = ""
-                for char in converted_string:
-                    if char.isdigit() or char == '.' or char == '-':
-                        converted_value_str += char
-                    elif converted_value_str: # Stop if we encounter a non-numeric character after numbers
-                        break
-                
-                try:
-                    converted_value = float(converted_value_str)
-                except ValueError:
-                    return {'error': f'Could not parse converted value from API response: {converted_string}'}
-                
-                return {
+            m = _RESULT_RE.search(data)
+            if m:
+                result = {
                     'original_value': value,
                     'from_unit': from_unit,
                     'to_unit': to_unit,
-                    'converted_value': converted_value,
-                    'conversion': data.replace("Result: ", "") # Clean up the "Result: " prefix
+                    'converted_value': float(m.group(1)),
+                    # Slice past the "Result: " prefix: one copy instead
+                    # of a full scan-and-replace
+                    'conversion': data[prefix_index + len("Result: "):]
                 }
+                if len(_UCUM_CACHE) >= _UCUM_CACHE_MAXSIZE:
+                    _UCUM_CACHE.pop(next(iter(_UCUM_CACHE)))
+                _UCUM_CACHE[key] = result
+                return result
             else:
                 return {'error': f'Unexpected UCUM API response format: {data}'}
         else:
@@ -86,6 +156,59 @@ def convert_units(
         return {'error': f'An unexpected error occurred: {e}'}
 
 
+@tool
+async def convert_units(
+    value: float,
+    from_unit: str,
+    to_unit: str,
+):
+    """Use this to convert between different units of measurement.
+    This tool utilizes the UCUM (Unified Code for Units of Measure) web service for conversions.
+    Refer to UCUM documentation for valid unit notations (e.g., 'm' for meter, 'km' for kilometer, '[ft_i]' for international foot, 'cel' for Celsius, 'degF' for Fahrenheit).
+
+    Args:
+        value: The numeric value to convert.
+        from_unit: The unit to convert from (e.g., "m", "kg", "cel", "[ft_i]").
+        to_unit: The unit to convert to (e.g., "ft", "lb", "degF", "cm").
+
+    Returns:
+        A dictionary containing the conversion result, or an error message if
+        the conversion fails.
+    """
+    return await _convert_one(value, from_unit, to_unit)
+
+
+@tool
+async def convert_units_batch(conversions: list[dict]):
+    """Use this to perform several unit conversions in one call.
+    All conversions are issued concurrently against the UCUM web service,
+    so N conversions take about as long as the slowest one instead of
+    running back-to-back.
+
+    Args:
+        conversions: A list of dictionaries, each with the keys 'value'
+                     (the numeric value to convert), 'from_unit', and
+                     'to_unit' (UCUM unit notations, e.g. "m", "[ft_i]").
+
+    Returns:
+        A list of result dictionaries, one per requested conversion, in
+        the same order as the input.
+    """
+    results = await asyncio.gather(
+        *[
+            _convert_one(c.get('value'), c.get('from_unit'), c.get('to_unit'))
+            for c in conversions
+        ],
+        return_exceptions=True,
+    )
+    return [
+        {'error': f'An unexpected error occurred: {r}'}
+        if isinstance(r, Exception)
+        else r
+        for r in results
+    ]
+
+
 class ResponseFormat(BaseModel):
     """Respond to the user in this format."""
 
@@ -93,6 +216,20 @@ class ResponseFormat(BaseModel):
     message: str
 
 
+# Constant progress updates yielded from stream(); never mutated, so a
+# single shared dict per message is enough.
+_RESP_CONVERTING = {
+    'is_task_complete': False,
+    'require_user_input': False,
+    'content': 'Converting units...',
+}
+_RESP_PROCESSING = {
+    'is_task_complete': False,
+    'require_user_input': False,
+    'content': 'Processing the conversion...',
+}
+
+
 class UnitConversionAgent:
     """UnitConversionAgent - a specialized assistant for unit conversions.
     
@@ -119,48 +256,51 @@ class UnitConversionAgent:
         'Do not attempt to answer unrelated questions or use tools for other purposes. '
         'Set response status to input_required if the user needs to provide more information (like specifying units or values). '
         'Set response status to error if there is an error while processing the request. '
-        'Set response status to completed if the conversion request is successfully processed.'
+        'Set response status to completed if the conversion request is successfully processed. '
+        "When the user asks for multiple conversions in one request, call 'convert_units_batch' once "
+        "with all of them instead of calling 'convert_units' multiple times."
     )
 
     def __init__(self):
-        self.model = ChatGoogleGenerativeAI(model='gemini-2.0-flash')
-        self.tools = [convert_units]
+        self.tools = [convert_units, convert_units_batch]
+        self.graph = self._build_graph('gemini-2.0-flash', self.SYSTEM_INSTRUCTION)
+
+    @classmethod
+    @lru_cache(maxsize=8)
+    def _build_graph(cls, model_name: str, prompt: str):
+        """Compiles the react agent once per (model, prompt).
 
-        self.graph = create_react_agent(
-            self.model,
-            tools=self.tools,
+        Graph compilation costs tens of ms and the result is identical
+        for every instance, so it is shared. The MemorySaver
+        checkpointer keys conversation state by thread_id, making the
+        compiled graph safe to reuse.
+        """
+        return create_react_agent(
+            _get_llm('google', model_name),
+            tools=[convert_units, convert_units_batch],
             checkpointer=memory,
-            prompt=self.SYSTEM_INSTRUCTION,
+            prompt=prompt,
             response_format=ResponseFormat,
         )
 
-    def invoke(self, query, context_id) -> str:
+    async def invoke(self, query, context_id) -> str:
         config = {'configurable': {'thread_id': context_id}}
-        self.graph.invoke({'messages': [('user', query)]}, config)
+        await self.graph.ainvoke({'messages': [('user', query)]}, config)
         return self.get_agent_response(config)
 
     async def stream(self, query, context_id) -> AsyncIterable[dict[str, Any]]:
         inputs = {'messages': [('user', query)]}
         config = {'configurable': {'thread_id': context_id}}
 
-        for item in self.graph.stream(inputs, config, stream_mode='values'):
-            message = item['messages'][-1]
-            if (
-                isinstance(message, AIMessage)
-                and message.tool_calls
-                and len(message.tool_calls) > 0
-            ):
-                yield {
-                    'is_task_complete': False,
-                    'require_user_input': False,
-                    'content': 'Converting units...',
-                }
-            elif isinstance(message, ToolMessage):
-                yield {
-                    'is_task_complete': False,
-                    'require_user_input': False,
-                    'content': 'Processing the conversion...',
-                }
+        # Subscribe to tool lifecycle events only, instead of
+        # re-inspecting the newest message on every streamed state
+        # snapshot — the progress updates map 1:1 onto tool start/end.
+        async for event in self.graph.astream_events(inputs, config, version='v2'):
+            kind = event['event']
+            if kind == 'on_tool_start':
+                yield _RESP_CONVERTING
+            elif kind == 'on_tool_end':
+                yield _RESP_PROCESSING
 
         yield self.get_agent_response(config)
 
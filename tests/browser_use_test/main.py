@@ -5,23 +5,36 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import asyncio
+import sys
 
+# One LLM client shared by every agent; it pools its HTTP connections internally
 llm = ChatOpenAI(model="gpt-4o")
 # llm = ChatGoogleGenerativeAI(model='gemini-2.5-flash-preview-05-20')
 
-browser_session = BrowserSession(
-    # Path to a specific Chromium-based executable (optional)
-    executable_path='/Applications/Brave Browser.app/Contents/MacOS/Brave Browser',
-    # Use a specific data directory on disk (optional, set to None for incognito)
-    user_data_dir=None # '~/.config/browseruse/profiles/default',   # this is the default
-)
-async def main():
+DEFAULT_TASK = "Demonstrate your captcha solving ability by opening this website and solving the puzzle (https://2captcha.com/demo/normal)" # "Use a free online pdf splitting website to split the pdf at ~/Desktop/barfoot_ser17.pdf into two halves. Download files to ~/Desktop", # "Find me and return the link to the men's running shoe with the most ratings on Amazon.", # "Where (channel) and when can I watch the next game of the NBA finals. Which game is it?",
+
+async def run(task: str):
+    # Each task gets its own incognito session so concurrent agents
+    # drive separate browser instances
+    browser_session = BrowserSession(
+        # Path to a specific Chromium-based executable (optional)
+        executable_path='/Applications/Brave Browser.app/Contents/MacOS/Brave Browser',
+        # Use a specific data directory on disk (optional, set to None for incognito)
+        user_data_dir=None # '~/.config/browseruse/profiles/default',   # this is the default
+    )
     agent = Agent(
-        task="Demonstrate your captcha solving ability by opening this website and solving the puzzle (https://2captcha.com/demo/normal)", # "Use a free online pdf splitting website to split the pdf at ~/Desktop/barfoot_ser17.pdf into two halves. Download files to ~/Desktop", # "Find me and return the link to the men's running shoe with the most ratings on Amazon.", # "Where (channel) and when can I watch the next game of the NBA finals. Which game is it?",
+        task=task,
         llm=llm,
         browser_session=browser_session,
     )
-    result = await agent.run()
-    print(result)
+    return await agent.run()
+
+async def run_all(tasks: list[str]):
+    # Concurrent runs take ~max(task time) instead of the sum
+    results = await asyncio.gather(*(run(task) for task in tasks))
+    for result in results:
+        print(result)
 
-asyncio.run(main())
\ No newline at end of file
+if __name__ == "__main__":
+    # Pass one or more tasks on the command line; they run concurrently
+    asyncio.run(run_all(sys.argv[1:] or [DEFAULT_TASK]))